@@ -1,9 +1,20 @@
 #!/usr/bin/env python3
 # BLEnumerator.py - A tool for interacting with Bluetooth Low Energy (BLE) devices
 
+import argparse
 import asyncio
+import functools
+import json
+import sys
+from collections import namedtuple
 from bleak import BleakScanner, BleakClient
+from bleak.uuids import normalize_uuid_str
 import logging
+import logging.handlers
+import os
+import queue
+import re
+import stat
 from colorama import init, Fore, Style
 from datetime import datetime
 import colorama
@@ -19,10 +30,14 @@ class ColoredFormatter(logging.Formatter):
         logging.WARNING: Fore.YELLOW + "%(asctime)s - %(name)s - %(levelname)s - %(message)s" + Style.RESET_ALL,
     }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Build one Formatter per level up front rather than on every record
+        self._formatters = {lvl: logging.Formatter(fmt) for lvl, fmt in self.FORMATS.items()}
+        self._default = logging.Formatter()
+
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
-        return formatter.format(record)
+        return self._formatters.get(record.levelno, self._default).format(record)
 
 # Set up logging
 logger = logging.getLogger("BLEnumerator")
@@ -38,172 +53,442 @@ timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 log_file = f"ble_dump_{timestamp}.txt"
 file_handler = logging.FileHandler(log_file)
 file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
-logger.addHandler(file_handler)
 
-# Standard UUID database (subset for example)
-STANDARD_UUIDS = {
-    "00002a00-0000-1000-8000-00805f9b34fb": "Device Name (readable string)",
-    "00002a01-0000-1000-8000-00805f9b34fb": "Appearance (device category)",
-    "00002a05-0000-1000-8000-00805f9b34fb": "Service Changed (indicates service updates)",
-    "00002a29-0000-1000-8000-00805f9b34fb": "Manufacturer Name String",
-}
+# File writes go through a queue to a background listener so disk I/O never blocks
+# a coroutine. The console handler stays synchronous to keep log lines in order
+# with the menus and prompts printed on the main thread.
+log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+log_listener.start()
+
+# Stdin stream used by ainput; opened on first use in the running event loop
+_stdin_reader = None
+_stdin_opened = False
+
+async def _open_stdin_reader(loop):
+    """Attach an asyncio StreamReader to stdin, or return None if stdin can't be read as a pipe."""
+    try:
+        fd = sys.stdin.fileno()
+        # A tty is reopened so the O_NONBLOCK set by the transport doesn't also hit stdout
+        if hasattr(os, "ttyname") and os.isatty(fd):
+            pipe = open(os.ttyname(fd), "rb", buffering=0)
+        elif stat.S_ISFIFO(os.fstat(fd).st_mode) or stat.S_ISSOCK(os.fstat(fd).st_mode):
+            pipe = os.fdopen(os.dup(fd), "rb", buffering=0)
+        else:
+            # Regular files and devices like /dev/null can't be polled
+            return None
+    except (OSError, ValueError):
+        return None
+    reader = asyncio.StreamReader()
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+    except (OSError, ValueError, NotImplementedError):
+        # e.g. the Windows proactor loop, which has no pipe transport for stdin
+        pipe.close()
+        return None
+    return reader
+
+async def ainput(prompt=""):
+    """Read a line from stdin without blocking the event loop."""
+    global _stdin_reader, _stdin_opened
+    if not _stdin_opened:
+        _stdin_reader = await _open_stdin_reader(asyncio.get_running_loop())
+        _stdin_opened = True
+    if _stdin_reader is None:
+        return input(prompt)
+
+    print(prompt, end="", flush=True)
+    line = await _stdin_reader.readline()
+    if not line:
+        raise EOFError
+    return line.decode(sys.stdin.encoding or "utf-8", errors="replace").rstrip("\r\n")
+
+# Standard UUID database (Bluetooth SIG assigned numbers), shipped next to this script.
+# Keys are normalized to the lowercase form bleak reports so lookups never miss on case,
+# and interned so they are shared with the interned UUIDs stored in CharInfo
+STANDARD_UUIDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "standard_uuids.json")
+try:
+    with open(STANDARD_UUIDS_FILE) as f:
+        STANDARD_UUIDS = {sys.intern(k.lower()): v for k, v in json.load(f).items()}
+except (OSError, ValueError) as e:
+    logger.warning(f"Could not load standard UUID database ({e}); all characteristics will be treated as vendor-specific.")
+    STANDARD_UUIDS = {}
+
+# Characteristic properties that allow reading / writing
+READ_PROPS = frozenset({"read"})
+WRITE_PROPS = frozenset({"write", "write-without-response"})
+
+# Lightweight wrapper around a bleak characteristic with its UUID canonicalized
+# (lowercase, interned) and its properties precomputed as a set. GATT operations
+# go through obj, since a UUID may be shared by several characteristics
+CharInfo = namedtuple("CharInfo", ["uuid", "properties_list", "properties_set", "obj"])
+
+# Lookup structures over a device's characteristics, built once at discovery time.
+# by_uuid maps each UUID to a list, since UUIDs are not unique on a device.
+CharIndex = namedtuple("CharIndex", ["by_uuid", "readable", "writable"])
+
+def make_char_info(char):
+    """Wrap a bleak characteristic in a CharInfo."""
+    return CharInfo(sys.intern(char.uuid.lower()), char.properties, frozenset(char.properties), char)
 
 def guess_characteristic_purpose(char, value=None):
-    """Guess the purpose of a characteristic based on UUID, properties, and value."""
-    uuid = char.uuid
-    props = char.properties
-    
-    # Check if it's a standard UUID
-    if uuid in STANDARD_UUIDS:
-        return STANDARD_UUIDS[uuid]
-    
-    # Vendor-specific UUID: make educated guesses
-    guess = "Vendor-specific: "
+    """Guess the purpose of a characteristic (CharInfo or bleak object) based on UUID, properties, and value."""
+    if not isinstance(char, CharInfo):
+        char = make_char_info(char)
+    return _guess_cached(char.uuid, char.properties_set, bytes(value) if value else None)
+
+# Value heuristics for vendor-specific characteristics, checked in order
+VALUE_KINDS = (
+    (lambda v: v in (0, 1), "possibly on/off or boolean"),
+    (lambda v: 0 <= v <= 100, "could be percentage, temp, etc."),
+)
+
+def _category(props):
+    """Describe a vendor-specific characteristic based on its properties."""
     if "read" in props and "notify" in props:
-        guess += "Possibly a sensor value or status (real-time updates)"
-    elif "read" in props:
-        guess += "Possibly a status, configuration, or static data"
-    elif "write" in props or "write-without-response" in props:
-        guess += "Likely a command or control input"
-    elif "notify" in props:
-        guess += "Possibly a notification-only status or event"
-    else:
-        guess += "Unknown purpose"
-
-    # Add value-based hints if available
+        return "Possibly a sensor value or status (real-time updates)"
+    if "read" in props:
+        return "Possibly a status, configuration, or static data"
+    if "write" in props or "write-without-response" in props:
+        return "Likely a command or control input"
+    if "notify" in props:
+        return "Possibly a notification-only status or event"
+    return "Unknown purpose"
+
+def _value_hint(value):
+    """Describe what a raw characteristic value might represent."""
+    hex_value = value.hex()
+    if len(value) > 8:
+        # Too long to be a plain integer; don't build a huge int for stream payloads
+        return f" (Value: {hex_value} - format unknown)"
+    dec_value = int.from_bytes(value, "little")
+    kind = next((desc for matches, desc in VALUE_KINDS if matches(dec_value)), "possibly a counter or raw data")
+    return f" (Value: {hex_value}/{dec_value} - {kind})"
+
+@functools.lru_cache(maxsize=256)
+def _guess_cached(uuid, props, value):
+    """Cached worker for guess_characteristic_purpose; arguments must be hashable."""
+    # Check if it's a standard UUID
+    desc = STANDARD_UUIDS.get(uuid)
+    if desc is not None:
+        return desc
+
+    # Vendor-specific UUID: make educated guesses, adding value-based hints if available
+    parts = ["Vendor-specific: ", _category(props)]
     if value:
-        try:
-            dec_value = int.from_bytes(value, "little")
-            hex_value = value.hex()
-            if 0 <= dec_value <= 100:
-                guess += f" (Value: {hex_value}/{dec_value} - could be percentage, temp, etc.)"
-            elif dec_value in [0, 1]:
-                guess += f" (Value: {hex_value}/{dec_value} - possibly on/off or boolean)"
-            else:
-                guess += f" (Value: {hex_value}/{dec_value} - possibly a counter or raw data)"
-        except:
-            guess += f" (Value: {value.hex()} - format unknown)"
-    
-    return guess
-
-async def scan_for_devices():
-    """Scan for nearby BLE devices and return a list."""
-    logger.info("Scanning for BLE devices (10 seconds)...")
-    devices = await BleakScanner.discover(timeout=10.0)
-    if not devices:
+        parts.append(_value_hint(value))
+    return "".join(parts)
+
+async def scan_iter(timeout=10.0, service_uuids=None):
+    """Yield (device, advertisement_data) pairs as adverts arrive, for up to `timeout` seconds.
+
+    Callers can act on (or break out at) the first match instead of waiting
+    for the scan to end. service_uuids restricts the scan to devices
+    advertising those services; the filter is applied by the OS backend
+    (e.g. BlueZ) so non-matching adverts are never parsed.
+    """
+    loop = asyncio.get_running_loop()
+    adverts = asyncio.Queue()
+
+    def cb(device, adv):
+        adverts.put_nowait((device, adv))
+
+    # These match bleak's defaults and are spelled out so the scan behavior is explicit:
+    # active scanning requests scan responses, and BlueZ drops exact duplicate adverts.
+    # The callback still fires on every RSSI or property change, so callers must
+    # dedupe by address themselves.
+    scanner_kwargs = {"scanning_mode": "active"}
+    if sys.platform.startswith("linux"):
+        scanner_kwargs["bluez"] = {"filters": {"DuplicateData": False}}
+
+    async with BleakScanner(detection_callback=cb, service_uuids=service_uuids, **scanner_kwargs):
+        end = loop.time() + timeout
+        while loop.time() < end:
+            try:
+                yield await asyncio.wait_for(adverts.get(), timeout=end - loop.time())
+            except asyncio.TimeoutError:
+                return
+
+async def scan_for_devices(desired_n=None, timeout=10.0, service_uuids=None):
+    """Scan for nearby BLE devices and return a list, strongest signal first.
+
+    Devices are logged as soon as they are first seen. If desired_n is given,
+    the scan stops once that many devices have been found instead of waiting
+    out the full timeout.
+    """
+    logger.info(f"Scanning for BLE devices (up to {timeout:g} seconds)...")
+    found = {}
+
+    adverts = scan_iter(timeout, service_uuids)
+    try:
+        async for device, adv in adverts:
+            if device.address not in found:
+                logger.info(f"Discovered: {device.address} - {device.name or 'Unnamed Device'} (RSSI: {adv.rssi} dBm)")
+            found[device.address] = (device, adv.rssi)
+            if desired_n and len(found) >= desired_n:
+                break
+    finally:
+        # Stop the scanner right away rather than when the generator is collected
+        await adverts.aclose()
+
+    if not found:
         logger.warning("No devices found.")
         return []
-    for device in devices:
-        logger.info(f"Discovered: {device.address} - {device.name or 'Unnamed Device'}")
-    return devices
+    # Sort once here so every listing of this scan shares the same ordering
+    by_rssi = sorted(found.values(), key=lambda entry: -(entry[1] if entry[1] is not None else -127))
+    return [device for device, _ in by_rssi]
+
+def enumerate_device(client):
+    """Enumerate services and characteristics of a connected device.
 
-async def enumerate_device(client):
-    """Enumerate services and characteristics of a connected device."""
-    services = await client.get_services()
+    Returns a tuple of (summary, index), where index is a CharIndex over the
+    CharInfo wrappers. The summary is a list of
+    (service_uuid, service_desc, [(char_uuid, props, purpose), ...]) entries
+    that can be re-printed with print_enumeration without touching the device.
+    """
+    # BleakClient populates its service collection on connect (bleak >= 0.20)
+    services = client.services
+    summary = []
     char_list = []
-    
-    logger.info("Services and Characteristics:")
+
     for service in services:
-        logger.info(f"Service: {service.uuid} - {service.description}")
+        chars = []
         for char in service.characteristics:
-            props = ", ".join(char.properties)
-            purpose = guess_characteristic_purpose(char)
-            logger.info(f"  Characteristic: {char.uuid} - Properties: [{props}] - Purpose: {purpose}")
-            char_list.append(char)
-    return char_list
+            info = make_char_info(char)
+            chars.append((info.uuid, tuple(info.properties_list), guess_characteristic_purpose(info)))
+            char_list.append(info)
+        summary.append((service.uuid, service.description, chars))
+    print_enumeration(summary)
+
+    by_uuid = {}
+    for c in char_list:
+        by_uuid.setdefault(c.uuid, []).append(c)
+    index = CharIndex(
+        by_uuid,
+        [c for c in char_list if READ_PROPS & c.properties_set],
+        [c for c in char_list if WRITE_PROPS & c.properties_set],
+    )
+    return summary, index
+
+def print_enumeration(summary):
+    """Log a previously built service/characteristic summary."""
+    logger.info("Services and Characteristics:")
+    for service_uuid, service_desc, chars in summary:
+        logger.info(f"Service: {service_uuid} - {service_desc}")
+        for char_uuid, props, purpose in chars:
+            logger.info(f"  Characteristic: {char_uuid} - Properties: [{', '.join(props)}] - Purpose: {purpose}")
+
+def log_value(char, value):
+    """Log a value read from a characteristic along with its guessed purpose."""
+    purpose = guess_characteristic_purpose(char, value)
+    # Only small values get a decimal form; long payloads would build a huge int
+    decimal = f" (Decimal: {int.from_bytes(value, 'little')})" if len(value) <= 8 else ""
+    logger.info(f"Value of {char.uuid}: {value.hex()}{decimal} - Purpose: {purpose}")
 
 async def read_characteristic(client, char):
     """Read the value of a specific characteristic."""
     try:
-        value = await client.read_gatt_char(char.uuid)
-        purpose = guess_characteristic_purpose(char, value)
-        logger.info(f"Value of {char.uuid}: {value.hex()} (Decimal: {int.from_bytes(value, 'little')}) - Purpose: {purpose}")
+        value = await client.read_gatt_char(char.obj)
+        log_value(char, value)
     except Exception as e:
         logger.error(f"Failed to read {char.uuid}: {e}")
 
+async def read_all(client, chars, limit=4):
+    """Read several characteristics concurrently, with at most `limit` reads in flight.
+
+    BLE stacks tend to drop or corrupt results under too many concurrent
+    operations, so the semaphore keeps the batch bounded (4-8 works well).
+    """
+    sem = asyncio.Semaphore(limit)
+
+    async def one(c):
+        async with sem:
+            return await client.read_gatt_char(c.obj)
+
+    # return_exceptions=True also returns CancelledError, which is a BaseException
+    results = await asyncio.gather(*(one(c) for c in chars), return_exceptions=True)
+    for char, value in zip(chars, results):
+        if isinstance(value, BaseException):
+            logger.error(f"Failed to read {char.uuid}: {value}")
+            continue
+        log_value(char, value)
+    return results
+
+def parse_write_value(value):
+    """Turn user input into bytes: '@path' loads a file as raw bytes, anything else is hex.
+
+    Hex may contain whitespace, ':', '_' or '-' separators (e.g. '01:02:03').
+    """
+    if value.startswith("@"):
+        with open(value[1:], "rb") as f:
+            return f.read()
+    return bytes.fromhex(re.sub(r"[\s:_-]", "", value))
+
 async def write_characteristic(client, char):
-    """Write a value to a specific characteristic."""
+    """Write a value to a specific characteristic.
+
+    Payloads larger than one ATT packet (MTU - 3) are sent as a series of
+    write-without-response chunks when the characteristic supports it, which
+    is much faster than a single long write with response.
+    """
+    value = (await ainput("Enter hex value to write (e.g., '010203') or @file for raw bytes: ")).strip()
     try:
-        value = input("Enter hex value to write (e.g., '010203'): ").strip()
-        data = bytes.fromhex(value)
-        await client.write_gatt_char(char.uuid, data)
-        logger.info(f"Wrote {value} to {char.uuid}")
+        data = parse_write_value(value)
     except ValueError:
         logger.error("Invalid hex string. Use format like '010203'.")
+        return
+    except OSError as e:
+        logger.error(f"Failed to load payload file: {e}")
+        return
+    # File payloads can be large, so log their size rather than their contents
+    shown = f"{len(data)} bytes from {value[1:]}" if value.startswith("@") else data.hex()
+
+    try:
+        chunk_size = client.mtu_size - 3
+        if len(data) > chunk_size and "write-without-response" in char.properties_set:
+            for i in range(0, len(data), chunk_size):
+                await client.write_gatt_char(char.obj, data[i:i + chunk_size], response=False)
+            logger.info(f"Wrote {shown} to {char.uuid} in {-(-len(data) // chunk_size)} chunks")
+        else:
+            await client.write_gatt_char(char.obj, data)
+            logger.info(f"Wrote {shown} to {char.uuid}")
     except Exception as e:
         logger.error(f"Failed to write to {char.uuid}: {e}")
 
-async def connect_and_interact(device):
-    """Connect to a device and provide a menu for interaction."""
+async def select_characteristic(label, chars, by_uuid, required_props):
+    """Prompt for one of chars by list number or UUID; returns None on invalid input.
+
+    UUIDs are resolved through the by_uuid index (uuid -> list of CharInfo)
+    rather than by walking the list. A UUID shared by several matching
+    characteristics (e.g. repeated HID Report characteristics) must be
+    selected by number instead.
+    """
+    print(f"\n{label} Characteristics:")
+    for i, char in enumerate(chars, 1):
+        print(f"{i}. {char.uuid} - Properties: [{', '.join(char.properties_list)}]")
+
+    selection = (await ainput(f"Select a characteristic (1-{len(chars)}) or enter its UUID: ")).strip()
+    try:
+        # Accept the same short forms (e.g. '2a19') as the service filter
+        uuid = normalize_uuid_str(selection)
+    except ValueError:
+        uuid = None
+    if uuid in by_uuid:
+        matches = [c for c in by_uuid[uuid] if required_props & c.properties_set]
+        if len(matches) == 1:
+            return matches[0]
+        if matches:
+            logger.error("Several characteristics share this UUID. Select one by number.")
+        else:
+            logger.error("Invalid selection.")
+        return None
+    try:
+        char_idx = int(selection) - 1
+    except ValueError:
+        logger.error("Please enter a valid number or UUID.")
+        return None
+    if 0 <= char_idx < len(chars):
+        return chars[char_idx]
+    logger.error("Invalid selection.")
+    return None
+
+async def device_menu(client, cached_enum, index):
+    """Run the device menu for a connected client.
+
+    Returns True if the user asked to disconnect, or False to go back to the
+    main menu with the connection kept open.
+    """
+    by_uuid, readable_chars, writable_chars = index
+
+    while True:
+        print("\n--- Device Menu ---")
+        print("1. List Characteristics")
+        print("2. Read from a Characteristic")
+        print("3. Write to a Characteristic")
+        print("4. Disconnect and Exit")
+        print("5. Read all Readable Characteristics")
+        print("6. Back to Main Menu (stay connected)")
+        choice = (await ainput("Select an option (1-6): ")).strip()
+
+        if choice == "1":
+            print_enumeration(cached_enum)
+        elif choice == "2":
+            if not readable_chars:
+                logger.warning("No readable characteristics available.")
+                continue
+            
+            char = await select_characteristic("Readable", readable_chars, by_uuid, READ_PROPS)
+            if char is not None:
+                await read_characteristic(client, char)
+        elif choice == "3":
+            if not writable_chars:
+                logger.warning("No writable characteristics available.")
+                continue
+            
+            char = await select_characteristic("Writable", writable_chars, by_uuid, WRITE_PROPS)
+            if char is not None:
+                await write_characteristic(client, char)
+        elif choice == "4":
+            return True
+        elif choice == "5":
+            if not readable_chars:
+                logger.warning("No readable characteristics available.")
+                continue
+            await read_all(client, readable_chars)
+        elif choice == "6":
+            return False
+        else:
+            logger.error("Invalid option. Choose 1-6.")
+
+async def disconnect_client(client):
+    """Disconnect a client, logging instead of raising if that fails."""
+    try:
+        await client.disconnect()
+    except Exception as e:
+        logger.error(f"Failed to disconnect from {client.address}: {e}")
+
+async def connect_and_interact(device, sessions):
+    """Connect to a device, or reuse an open connection, and provide a menu for interaction.
+
+    device must be a BLEDevice from a scan or lookup. sessions maps device
+    addresses to (client, cached_enum, index) for connections that
+    are kept open while the user is in the main menu.
+    """
     address = device.address
     name = device.name or "Unnamed Device"
-    
-    logger.info(f"Connecting to {name} ({address})...")
+    client = None
+    stay_connected = False
+
     try:
-        async with BleakClient(address) as client:
-            if not await client.is_connected():
-                logger.error(f"Failed to connect to {name} ({address})")
-                return
-            
+        session = sessions.get(address)
+        if session and session[0].is_connected:
+            logger.info(f"Reusing connection to {name} ({address})")
+            client, cached_enum, index = session
+        else:
+            logger.info(f"Connecting to {name} ({address})...")
+            # Passing the BLEDevice (not its address) stops bleak from scanning again inside connect()
+            client = BleakClient(device)
+            # connect() raises on failure, so there is no separate connected check
+            await client.connect()
             logger.info(f"Connected to {name} ({address})")
-            characteristics = await enumerate_device(client)
-            readable_chars = [c for c in characteristics if "read" in c.properties]
-            writable_chars = [c for c in characteristics if "write" in c.properties or "write-without-response" in c.properties]
-
-            while True:
-                print("\n--- Device Menu ---")
-                print("1. List Characteristics")
-                print("2. Read from a Characteristic")
-                print("3. Write to a Characteristic")
-                print("4. Disconnect and Exit")
-                choice = input("Select an option (1-4): ").strip()
-
-                if choice == "1":
-                    await enumerate_device(client)
-                elif choice == "2":
-                    if not readable_chars:
-                        logger.warning("No readable characteristics available.")
-                        continue
-                    
-                    print("\nReadable Characteristics:")
-                    for i, char in enumerate(readable_chars, 1):
-                        print(f"{i}. {char.uuid} - Properties: [{', '.join(char.properties)}]")
-                    
-                    try:
-                        char_idx = int(input("Select a characteristic (1-{}): ".format(len(readable_chars)))) - 1
-                        if 0 <= char_idx < len(readable_chars):
-                            await read_characteristic(client, readable_chars[char_idx])
-                        else:
-                            logger.error("Invalid selection.")
-                    except ValueError:
-                        logger.error("Please enter a valid number.")
-                elif choice == "3":
-                    if not writable_chars:
-                        logger.warning("No writable characteristics available.")
-                        continue
-                    
-                    print("\nWritable Characteristics:")
-                    for i, char in enumerate(writable_chars, 1):
-                        print(f"{i}. {char.uuid} - Properties: [{', '.join(char.properties)}]")
-                    
-                    try:
-                        char_idx = int(input("Select a characteristic (1-{}): ".format(len(writable_chars)))) - 1
-                        if 0 <= char_idx < len(writable_chars):
-                            await write_characteristic(client, writable_chars[char_idx])
-                        else:
-                            logger.error("Invalid selection.")
-                    except ValueError:
-                        logger.error("Please enter a valid number.")
-                elif choice == "4":
-                    logger.info("Disconnecting...")
-                    break
-                else:
-                    logger.error("Invalid option. Choose 1-4.")
+            # GATT layout does not change during a session, so enumerate once
+            cached_enum, index = enumerate_device(client)
+            sessions[address] = (client, cached_enum, index)
 
+        stay_connected = not await device_menu(client, cached_enum, index)
+        if not stay_connected:
+            logger.info("Disconnecting...")
     except Exception as e:
         logger.error(f"Error with {name} ({address}): {e}")
+    finally:
+        # Runs on errors and cancellation (Ctrl+C) too, so the device is never left connected
+        if not stay_connected:
+            sessions.pop(address, None)
+            if client is not None:
+                await disconnect_client(client)
 
-async def main():
+async def main(scan_timeout=10.0):
     """Main function with menu-driven BLE interaction."""
     # Banner
     print("\033[1mBLEnumerator\033[0m")
@@ -211,41 +496,89 @@ async def main():
     print()  # Adds a blank line for separation
 
     logger.info(f"Starting BLEnumerator. Log file: {log_file}")
-    
-    while True:
-        print("\n--- Main Menu ---")
-        print("1. Scan for Devices")
-        print("2. Exit")
-        choice = input("Select an option (1-2): ").strip()
 
-        if choice == "1":
-            devices = await scan_for_devices()
-            if not devices:
-                continue
+    # Open connections by address, kept alive across visits to the main menu
+    sessions = {}
+    last_device = None
+
+    try:
+        while True:
+            print("\n--- Main Menu ---")
+            print("1. Scan for Devices")
+            print("2. Reconnect to Last Device")
+            print("3. Exit")
+            choice = (await ainput("Select an option (1-3): ")).strip()
+
+            if choice == "1":
+                desired = (await ainput("Stop after how many devices (blank for full scan): ")).strip()
+                try:
+                    desired_n = int(desired) if desired else None
+                    if desired_n is not None and desired_n < 1:
+                        raise ValueError(desired)
+                except ValueError:
+                    logger.error("Please enter a valid number.")
+                    continue
+                service_filter = (await ainput("Filter by service UUID (blank for all): ")).strip()
+                if service_filter:
+                    try:
+                        # Accepts 16/32-bit short forms and rejects anything the backend would choke on
+                        service_filter = normalize_uuid_str(service_filter)
+                    except ValueError:
+                        logger.error("Invalid service UUID. Use a form like '180f' or '0000180f-0000-1000-8000-00805f9b34fb'.")
+                        continue
+                devices = await scan_for_devices(desired_n, timeout=scan_timeout, service_uuids=[service_filter] if service_filter else None)
+                if not devices:
+                    continue
 
-            print("\nDiscovered Devices:")
-            for i, device in enumerate(devices, 1):
-                name = device.name or "Unnamed Device"
-                print(f"{i}. {name} ({device.address})")
+                print("\nDiscovered Devices:")
+                for i, device in enumerate(devices, 1):
+                    name = device.name or "Unnamed Device"
+                    print(f"{i}. {name} ({device.address})")
             
-            try:
-                dev_idx = int(input("Select a device (1-{}): ".format(len(devices)))) - 1
-                if 0 <= dev_idx < len(devices):
-                    await connect_and_interact(devices[dev_idx])
-                else:
-                    logger.error("Invalid selection.")
-            except ValueError:
-                logger.error("Please enter a valid number.")
-        elif choice == "2":
-            logger.info("Exiting...")
-            break
-        else:
-            logger.error("Invalid option. Choose 1-2.")
+                try:
+                    dev_idx = int(await ainput("Select a device (1-{}): ".format(len(devices)))) - 1
+                    if 0 <= dev_idx < len(devices):
+                        last_device = devices[dev_idx]
+                        await connect_and_interact(last_device, sessions)
+                    else:
+                        logger.error("Invalid selection.")
+                except ValueError:
+                    logger.error("Please enter a valid number.")
+            elif choice == "2":
+                if last_device is None:
+                    logger.warning("No previous device. Scan for devices first.")
+                    continue
+                session = sessions.get(last_device.address)
+                if not (session and session[0].is_connected):
+                    # Only wait for the one known address instead of running a full scan
+                    logger.info(f"Looking for {last_device.address}...")
+                    device = await BleakScanner.find_device_by_address(last_device.address, timeout=5.0)
+                    if device is None:
+                        logger.warning(f"Device {last_device.address} not found.")
+                        continue
+                    last_device = device
+                await connect_and_interact(last_device, sessions)
+            elif choice == "3":
+                logger.info("Exiting...")
+                break
+            else:
+                logger.error("Invalid option. Choose 1-3.")
+    finally:
+        # Close connections left open with "Back to Main Menu", including on Ctrl+C or errors
+        for client, _, _ in list(sessions.values()):
+            await disconnect_client(client)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Interact with Bluetooth Low Energy (BLE) devices.")
+    parser.add_argument("--fast", action="store_true",
+                        help="use a 2 second scan timeout for quick rediscovery of nearby devices")
+    args = parser.parse_args()
     try:
-        asyncio.run(main())
+        asyncio.run(main(scan_timeout=2.0 if args.fast else 10.0))
     except KeyboardInterrupt:
         logger.info("Script terminated by user.")
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
+    finally:
+        # Flush any queued records before the interpreter exits
+        log_listener.stop()